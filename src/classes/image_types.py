@@ -25,11 +25,13 @@
  along with OpenShot Library.  If not, see <http://www.gnu.org/licenses/>.
  """
 
+import os
+
+# Known image file extensions (lower-case, with leading dot)
+IMAGE_EXTENSIONS = frozenset({
+    ".jpg", ".jpeg", ".png", ".bmp", ".svg", ".thm", ".gif", ".pgm", ".tif", ".tiff"})
+
+
 def is_image(file):
     """Check a File object if the file extension is a known image format"""
-    path = file["path"].lower()
-
-    if path.endswith((".jpg", ".jpeg", ".png", ".bmp", ".svg", ".thm", ".gif", ".bmp", ".pgm", ".tif", ".tiff")):
-        return True
-    else:
-        return False
\ No newline at end of file
+    return os.path.splitext(file["path"])[1].lower() in IMAGE_EXTENSIONS
\ No newline at end of file
@@ -30,14 +30,20 @@ import os
 import json
 import re
 import glob
+from functools import partial
+
+try:
+    # Use the C-accelerated parser for large reader JSON blobs (optional)
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
 
 from PyQt5.QtCore import (
-    QMimeData, Qt, pyqtSignal, QEventLoop, QObject,
+    QMimeData, Qt, pyqtSignal, QEventLoop, QObject, QTimer,
+    QAbstractTableModel, QModelIndex, QRunnable, QThreadPool,
     QSortFilterProxyModel, QItemSelectionModel, QPersistentModelIndex,
 )
-from PyQt5.QtGui import (
-    QIcon, QStandardItem, QStandardItemModel
-)
+from PyQt5.QtGui import QIcon
 from classes import updates
 from classes import info
 from classes.image_types import is_image
@@ -48,16 +54,48 @@ from requests import get
 
 import openshot
 
+# Well-known media file extensions, used to short-circuit media-type
+# detection without waiting on a libopenshot reader probe
+EXT_MEDIA_TYPES = {}
+EXT_MEDIA_TYPES.update(dict.fromkeys(
+    [".jpg", ".jpeg", ".png", ".bmp", ".svg", ".thm", ".gif", ".pgm", ".tif", ".tiff"], "image"))
+EXT_MEDIA_TYPES.update(dict.fromkeys(
+    [".mp3", ".wav", ".ogg", ".flac", ".aac", ".m4a", ".wma", ".ac3"], "audio"))
+EXT_MEDIA_TYPES.update(dict.fromkeys(
+    [".mp4", ".avi", ".mov", ".mkv", ".mpg", ".mpeg", ".m4v", ".webm", ".wmv", ".flv", ".3gp", ".mts", ".m2ts"],
+    "video"))
+
+
+def scan_media_paths(folder_path):
+    """Recursively collect the media file paths under a folder, reusing
+    the type metadata os.scandir caches from each directory read (instead
+    of issuing an extra stat per entry). Files with unknown extensions
+    are skipped, so they never reach the (expensive) reader probe or
+    raise an invalid-file dialog"""
+    paths = []
+    try:
+        with os.scandir(folder_path) as entries:
+            for entry in entries:
+                if entry.is_file(follow_symlinks=False):
+                    if os.path.splitext(entry.name)[1].lower() in EXT_MEDIA_TYPES:
+                        paths.append(entry.path)
+                elif entry.is_dir(follow_symlinks=False):
+                    paths.extend(scan_media_paths(entry.path))
+    except OSError as ex:
+        log.warning("Couldn't scan folder {}: {}".format(folder_path, ex))
+    return paths
+
 
 class FileFilterProxyModel(QSortFilterProxyModel):
     """Proxy class used for sorting and filtering model data"""
 
     def filterAcceptsRow(self, sourceRow, sourceParent):
         """Filter for text"""
-        if get_app().window.actionFilesShowVideo.isChecked() \
-                or get_app().window.actionFilesShowAudio.isChecked() \
-                or get_app().window.actionFilesShowImage.isChecked() \
-                or get_app().window.filesFilter.text():
+        win = get_app().window
+        if win.actionFilesShowVideo.isChecked() \
+                or win.actionFilesShowAudio.isChecked() \
+                or win.actionFilesShowImage.isChecked() \
+                or win.filesFilter.text():
             # Fetch the file name
             index = self.sourceModel().index(sourceRow, 0, sourceParent)
             file_name = self.sourceModel().data(index)  # file name (i.e. MyVideo.mp4)
@@ -69,13 +107,13 @@ class FileFilterProxyModel(QSortFilterProxyModel):
             index = self.sourceModel().index(sourceRow, 2, sourceParent)
             tags = self.sourceModel().data(index)  # tags (i.e. intro, custom, etc...)
 
-            if get_app().window.actionFilesShowVideo.isChecked():
+            if win.actionFilesShowVideo.isChecked():
                 if not media_type == "video":
                     return False
-            elif get_app().window.actionFilesShowAudio.isChecked():
+            elif win.actionFilesShowAudio.isChecked():
                 if not media_type == "audio":
                     return False
-            elif get_app().window.actionFilesShowImage.isChecked():
+            elif win.actionFilesShowImage.isChecked():
                 if not media_type == "image":
                     return False
 
@@ -106,9 +144,176 @@ class FileFilterProxyModel(QSortFilterProxyModel):
         super().__init__(**kwargs)
 
 
+class FilesItemModel(QAbstractTableModel):
+    """Table model backed by plain Python rows, avoiding the per-item
+    allocation and signal overhead of QStandardItemModel on large projects"""
+
+    # Number of columns exposed to views (several are hidden)
+    COLUMN_COUNT = 6
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # Parallel column lists, kept in lock-step with row order, so
+        # callers can read cell values without crossing into Qt
+        self.ids = []
+        self.names = []
+        self.tags = []
+        self.media_types = []
+        self.paths = []
+        self.icons = []
+        self.tooltips = []
+        # Display text per column (column 0 shows the name next to the
+        # thumbnail icon). These alias the lists above; never rebind them.
+        self._columns = (self.names, self.names, self.tags,
+                         self.media_types, self.paths, self.ids)
+        self._headers = []
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.ids)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self.COLUMN_COUNT
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self.ids):
+            return None
+        col = index.column()
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return self._columns[col][index.row()]
+        if col == 0:
+            if role == Qt.DecorationRole:
+                return self.icons[index.row()]
+            if role == Qt.ToolTipRole:
+                return self.tooltips[index.row()]
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or not 0 <= index.row() < len(self.ids):
+            return False
+        col = index.column()
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            self._columns[col][index.row()] = value
+            if self._columns[col] is self.names:
+                # Name is displayed in both columns 0 and 1
+                self.dataChanged.emit(index.sibling(index.row(), 0),
+                                      index.sibling(index.row(), 1), [role])
+                return True
+        elif role == Qt.DecorationRole and col == 0:
+            self.icons[index.row()] = value
+        else:
+            return False
+        self.dataChanged.emit(index, index, [role])
+        return True
+
+    def flags(self, index):
+        flags = Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemIsDragEnabled
+        if index.column() in (1, 2, 3):
+            flags |= Qt.ItemIsEditable
+        elif index.column() in (4, 5):
+            flags |= Qt.ItemIsUserCheckable
+        return flags
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole \
+                and 0 <= section < len(self._headers):
+            return self._headers[section]
+        return None
+
+    def setHorizontalHeaderLabels(self, labels):
+        self._headers = list(labels)
+        self.headerDataChanged.emit(Qt.Horizontal, 0, self.COLUMN_COUNT - 1)
+
+    def appendRow(self, row_data):
+        self.appendRows([row_data])
+
+    def appendRows(self, rows):
+        """Append a batch of rows with a single ranged insert signal"""
+        if not rows:
+            return
+        first = len(self.ids)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        for row_data in rows:
+            self.ids.append(row_data["id"])
+            self.names.append(row_data["name"])
+            self.tags.append(row_data["tags"])
+            self.media_types.append(row_data["media_type"])
+            self.paths.append(row_data["path"])
+            self.icons.append(row_data["icon"])
+            self.tooltips.append(row_data["tooltip"])
+        self.endInsertRows()
+
+    def removeRows(self, row, count, parent=QModelIndex()):
+        if row < 0 or count < 1 or row + count > len(self.ids):
+            return False
+        self.beginRemoveRows(parent, row, row + count - 1)
+        for column in (self.ids, self.names, self.tags, self.media_types,
+                       self.paths, self.icons, self.tooltips):
+            del column[row:row + count]
+        self.endRemoveRows()
+        return True
+
+    def clear(self):
+        self.beginResetModel()
+        for column in (self.ids, self.names, self.tags, self.media_types,
+                       self.paths, self.icons, self.tooltips):
+            column.clear()
+        self.endResetModel()
+
+
+class FileProbeSignals(QObject):
+    """Signal carrier for FileProbeRunnable (QRunnable cannot emit)"""
+    finished = pyqtSignal(str, dict, int)
+    failed = pyqtSignal(str, str, int)
+    skipped = pyqtSignal(str, int)
+
+
+class FileProbeRunnable(QRunnable):
+    """Probe a media file on a thread-pool thread (libopenshot reader
+    open + JSON parse), reporting back to the UI thread via signals"""
+
+    def __init__(self, model, filepath):
+        super().__init__()
+        self.model = model
+        self.filepath = filepath
+        self.generation = model.probe_generation
+        self.signals = FileProbeSignals()
+
+    def run(self):
+        if self.generation != self.model.probe_generation:
+            # The project changed since this probe was queued (its
+            # pending state is gone), so just drop it
+            return
+        if self.filepath in self.model.imported_seq_paths:
+            # Claimed by an image sequence import while queued; skip
+            # the (expensive) reader open entirely
+            self.signals.skipped.emit(self.filepath, self.generation)
+            return
+        try:
+            file_data = self.model.probe_file(self.filepath)
+            self.signals.finished.emit(self.filepath, file_data, self.generation)
+        except Exception as ex:
+            self.signals.failed.emit(self.filepath, str(ex), self.generation)
+
+
 class FilesModel(QObject, updates.UpdateInterface):
     ModelRefreshed = pyqtSignal()
 
+    # Emitted after a probed file is saved into the project
+    # (original dropped path, new file id)
+    FileImported = pyqtSignal(str, str)
+
+    # Emitted when a queued import ends without adding a file for its
+    # path (failed probe, or the file was claimed by an image sequence)
+    FileImportFailed = pyqtSignal(str)
+
+    # On-disk cache of reader probe results, keyed by file path
+    PROBE_CACHE_PATH = os.path.join(info.USER_PATH, "probe_cache.json")
+    PROBE_CACHE_LIMIT = 1000
+
     # This method is invoked by the UpdateManager each time a change happens (i.e UpdateInterface)
     def changed(self, action):
 
@@ -116,246 +321,433 @@ class FilesModel(QObject, updates.UpdateInterface):
         if (len(action.key) >= 1 and action.key[0].lower() == "files") or action.type == "load":
             # Refresh project files model
             if action.type == "insert":
+                if self.batch_updates:
+                    # add_files will refresh once the whole batch is saved
+                    return
                 # Don't clear the existing items if only inserting new things
                 self.update_model(clear=False)
             elif action.type == "delete" and action.key[0].lower() == "files":
                 # Don't clear the existing items if only deleting things
+                self.files_by_id.pop(action.key[1].get('id', ''), None)
                 self.update_model(clear=False, delete_file_id=action.key[1].get('id', ''))
             elif action.type == "update" and action.key[0].lower() == "files":
-                # Do nothing for file updates
-                pass
+                # Evict the cached File object (re-queried on next use)
+                self.files_by_id.pop(action.key[1].get('id', ''), None)
             else:
+                if action.type == "load":
+                    # Abandon in-flight probes, so their results can't
+                    # save files into the newly loaded project
+                    self.invalidate_pending_probes()
                 # Clear existing items
                 self.update_model(clear=True)
 
     def update_model(self, clear=True, delete_file_id=None):
         log.info("updating files model.")
-        app = get_app()
-
+        if self._refreshing:
+            # Re-entrancy guard: the row loop below pumps the event loop
+            # (processEvents), which can fire timers that call back in
+            # here before queued rows are registered in model_ids
+            if delete_file_id:
+                # A deletion refresh carries payload we can't just drop;
+                # retry it once the current refresh has finished
+                log.info("Deferring removal of {} (model refresh running)".format(delete_file_id))
+                QTimer.singleShot(0, partial(self.update_model, clear, delete_file_id))
+            return
+        app = self.app
+
+        self._refreshing = True
         self.ignore_updates = True
-
-        # Translations
-        _ = app._tr
-
-        # Delete a file (if delete_file_id passed in)
-        if delete_file_id in self.model_ids:
-            # Use the persistent index we stored to find the row
-            id_index = self.model_ids[delete_file_id]
-
-            # sanity check
-            if not id_index.isValid() or delete_file_id != id_index.data():
-                log.warning("Couldn't remove {} from model!".format(delete_file_id))
-                return
-            # Delete row from model
-            row_num = id_index.row()
-            self.model.removeRows(row_num, 1, id_index.parent())
-            self.model.submit()
-            self.model_ids.pop(delete_file_id)
-
-        # Clear all items
-        if clear:
-            self.model_ids = {}
-            self.model.clear()
-
-        # Add Headers
-        self.model.setHorizontalHeaderLabels(["", _("Name"), _("Tags")])
-
-        # Get list of files in project
-        files = File.filter()  # get all files
-
-        # add item for each file
-        row_added_count = 0
-        for file in files:
-            id = file.data["id"]
-            if id in self.model_ids and self.model_ids[id].isValid():
-                # Ignore files that already exist in model
-                continue
-
-            path, filename = os.path.split(file.data["path"])
-            tags = ""
-            if "tags" in file.data.keys():
-                tags = file.data["tags"]
-            name = filename
-            if "name" in file.data.keys():
-                name = file.data["name"]
-
-            media_type = file.data.get("media_type")
-
-            # Generate thumbnail for file (if needed)
-            if media_type in ["video", "image"]:
-                # Check for start and end attributes (optional)
-                thumbnail_frame = 1
-                if 'start' in file.data.keys():
-                    fps = file.data["fps"]
-                    fps_float = float(fps["num"]) / float(fps["den"])
-                    thumbnail_frame = round(float(file.data['start']) * fps_float) + 1
-
-                # Get thumb path
-                thumb_path = self.get_thumb_path(file.id, thumbnail_frame)
-            else:
-                # Audio file
-                thumb_path = os.path.join(info.PATH, "images", "AudioThumbnail.png")
-
-            row = []
-
-            # Append thumbnail
-            col = QStandardItem(name)
-            col.setIcon(QIcon(thumb_path))
-            col.setToolTip(filename)
-            col.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemIsDragEnabled)
-            row.append(col)
-
-            # Append Filename
-            col = QStandardItem(name)
-            col.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemIsDragEnabled | Qt.ItemIsEditable)
-            row.append(col)
-
-            # Append Tags
-            col = QStandardItem(tags)
-            col.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemIsDragEnabled | Qt.ItemIsEditable)
-            row.append(col)
-
-            # Append Media Type
-            col = QStandardItem(media_type)
-            col.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemIsDragEnabled | Qt.ItemIsEditable)
-            row.append(col)
-
-            # Append Path
-            col = QStandardItem(path)
-            col.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemIsUserCheckable | Qt.ItemIsDragEnabled)
-            row.append(col)
-
-            # Append ID
-            col = QStandardItem(id)
-            col.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemIsUserCheckable | Qt.ItemIsDragEnabled)
-            row.append(col)
-
-            # Append ROW to MODEL (if does not already exist in model)
-            if id not in self.model_ids:
-                self.model.appendRow(row)
-                # Link the file ID hash to that column of the table row by persistent index
-                self.model_ids[id] = QPersistentModelIndex(row[5].index())
-
-                row_added_count += 1
-                if row_added_count % 2 == 0:
-                    # Update every X items
-                    get_app().processEvents(QEventLoop.ExcludeUserInputEvents)
-
-            # Refresh view and filters (to hide or show this new item)
-            get_app().window.resize_contents()
-
-        self.ignore_updates = False
+        try:
+            # Translations
+            _ = app._tr
+
+            # Delete a file (if delete_file_id passed in)
+            if delete_file_id in self.model_ids:
+                # Use the persistent index we stored to find the row
+                id_index = self.model_ids[delete_file_id]
+
+                # sanity check
+                if not id_index.isValid() or delete_file_id != id_index.data():
+                    log.warning("Couldn't remove {} from model!".format(delete_file_id))
+                    return
+                # Delete row from model
+                row_num = id_index.row()
+                self.model.removeRows(row_num, 1, id_index.parent())
+                self.model.submit()
+                self.model_ids.pop(delete_file_id)
+
+            # Clear all items
+            if clear:
+                self.model_ids = {}
+                self.files_by_id = {}
+                self.drag_pixmaps = {}
+                self.model.clear()
+
+            # Add Headers
+            self.model.setHorizontalHeaderLabels(["", _("Name"), _("Tags")])
+
+            # Get list of files in project
+            files = File.filter()  # get all files
+
+            # add item for each file
+            new_rows = []
+            row_added_count = 0
+            for file in files:
+                id = file.data["id"]
+                self.files_by_id[id] = file
+                if id in self.model_ids and self.model_ids[id].isValid():
+                    # Ignore files that already exist in model
+                    continue
+
+                path, filename = os.path.split(file.data["path"])
+                tags = ""
+                if "tags" in file.data:
+                    tags = file.data["tags"]
+                name = filename
+                if "name" in file.data:
+                    name = file.data["name"]
+
+                media_type = file.data.get("media_type")
+
+                # Generate thumbnail for file (if needed)
+                if media_type in ["video", "image"]:
+                    # Check for start and end attributes (optional)
+                    thumbnail_frame = 1
+                    if 'start' in file.data:
+                        fps = file.data["fps"]
+                        fps_float = float(fps["num"]) / float(fps["den"])
+                        thumbnail_frame = round(float(file.data['start']) * fps_float) + 1
+
+                    # Get thumb path
+                    thumb_path = self.get_thumb_path(file.id, thumbnail_frame)
+                else:
+                    # Audio file
+                    thumb_path = os.path.join(info.PATH, "images", "AudioThumbnail.png")
+
+                row = {
+                    "icon": QIcon(thumb_path),
+                    "tooltip": filename,
+                    "name": name,
+                    "tags": tags,
+                    "media_type": media_type,
+                    "path": path,
+                    "id": id,
+                }
+
+                # Queue ROW for the model (if does not already exist in model)
+                if id not in self.model_ids:
+                    new_rows.append(row)
+
+                    row_added_count += 1
+                    if row_added_count % 2 == 0:
+                        # Keep UI responsive while thumbnails are fetched
+                        app.processEvents(QEventLoop.ExcludeUserInputEvents)
+
+            # Append all queued rows in a single ranged insert, and link each
+            # file ID hash to its ID column by persistent index
+            if new_rows:
+                first_row = self.model.rowCount()
+                self.model.appendRows(new_rows)
+                for row_num, row in enumerate(new_rows, start=first_row):
+                    self.model_ids[row["id"]] = QPersistentModelIndex(
+                        self.model.index(row_num, 5))
+
+                # Refresh view and filters (to hide or show the new items)
+                app.window.resize_contents()
+
+        finally:
+            self.ignore_updates = False
+            self._refreshing = False
 
         # Emit signal when model is updated
         self.ModelRefreshed.emit()
 
     def add_files(self, files, image_seq_details=None):
-        # Access translations
-        app = get_app()
-        _ = app._tr
-
         # Make sure we're working with a list of files
         if not isinstance(files, (list, tuple)):
             files = [files]
 
+        # Load the probe cache before worker threads need it
+        self.load_probe_cache()
+
+        files_queued = False
         for filepath in files:
-            (dir_path, filename) = os.path.split(filepath)
+            # Import the contents of dropped folders recursively
+            if os.path.isdir(filepath):
+                if self.add_files(scan_media_paths(filepath), image_seq_details):
+                    files_queued = True
+                continue
 
-            # Check for this path in our existing project data
-            file = File.get(path=filepath)
+            # Skip files already found in our existing project data
+            if File.get(path=filepath):
+                continue
 
-            # If this file is already found, exit
-            if file:
+            # Probe each file on the global thread pool (so the event
+            # loop stays responsive); results arrive back on the UI
+            # thread in file_probe_finished
+            if image_seq_details:
+                self.pending_seq_details[filepath] = image_seq_details
+            runner = FileProbeRunnable(self, filepath)
+            runner.signals.finished.connect(self.file_probe_finished)
+            runner.signals.failed.connect(self.file_probe_failed)
+            runner.signals.skipped.connect(self.file_probe_skipped)
+            self.pending_probes += 1
+            files_queued = True
+
+            # Defer per-insert model refreshes while probes are in flight
+            self.batch_updates = True
+
+            QThreadPool.globalInstance().start(runner)
+
+        return files_queued
+
+    def invalidate_pending_probes(self):
+        """Abandon in-flight probes (i.e. when a new project is loaded);
+        bumping the generation makes queued runnables drop out and any
+        results already emitted get discarded as stale"""
+        self.probe_generation += 1
+        self.pending_probes = 0
+        self.batch_updates = False
+        self.pending_seq_details.clear()
+        self.imported_seq_paths.clear()
+        self.deferred_probe_results.clear()
+
+    def probe_done(self):
+        """Track probe completion; refresh the model (coalesced) and
+        tear down batch state once the last probe reports in"""
+        self.pending_probes -= 1
+        if self.pending_probes <= 0:
+            self.pending_probes = 0
+            self.batch_updates = False
+            self.imported_seq_paths.clear()
+            self.ignore_image_sequence_paths = []
+            self.save_probe_cache()
+
+        # Coalesce model refreshes while results stream in
+        self.refresh_timer.start()
+
+    def file_probe_failed(self, filepath, error, generation):
+        """Report a failed probe (runs on the UI thread)"""
+        if generation != self.probe_generation:
+            # Stale result from before a project load
+            return
+        self.pending_seq_details.pop(filepath, None)
+        log.warning("Failed to import {}: {}".format(filepath, error))
+        self.app.window.invalidImage(os.path.split(filepath)[1])
+        self.FileImportFailed.emit(filepath)
+        self.probe_done()
+
+    def file_probe_skipped(self, filepath, generation):
+        """Account for a probe skipped on the worker thread (its file
+        was claimed by an image sequence import)"""
+        if generation != self.probe_generation:
+            return
+        self.pending_seq_details.pop(filepath, None)
+        self.FileImportFailed.emit(filepath)
+        self.probe_done()
+
+    def load_probe_cache(self):
+        """Load the probe cache from disk (the first time only)"""
+        if self.probe_cache is not None:
+            return
+        self.probe_cache = {}
+        try:
+            with open(self.PROBE_CACHE_PATH, "rb") as f:
+                self.probe_cache = json_loads(f.read())
+        except (OSError, ValueError):
+            pass
+
+    def probe_file(self, filepath):
+        """Get the reader JSON data for a media file, consulting a
+        persistent probe cache before opening a libopenshot reader"""
+        try:
+            file_stat = os.stat(filepath)
+        except OSError:
+            file_stat = None
+
+        # Load the cache from disk the first time it is needed
+        self.load_probe_cache()
+
+        # Return cached data (only when mtime and size still match)
+        if file_stat:
+            cached = self.probe_cache.get(filepath)
+            if cached and cached.get("mtime") == file_stat.st_mtime \
+                    and cached.get("size") == file_stat.st_size:
+                return dict(cached["data"])
+
+        # Load filepath in libopenshot clip object (which will try multiple readers to open it)
+        clip = openshot.Clip(filepath)
+
+        # Get the JSON for the clip's internal reader (single call into
+        # libopenshot; the string can be large for many-stream files)
+        reader_json = clip.Reader().Json()
+        file_data = json_loads(reader_json)
+
+        # Cache the probe result for this exact file version
+        if file_stat:
+            self.probe_cache[filepath] = {
+                "mtime": file_stat.st_mtime,
+                "size": file_stat.st_size,
+                "data": file_data,
+            }
+            self.probe_cache_dirty = True
+
+        return dict(file_data)
+
+    def save_probe_cache(self):
+        """Write the probe cache back to the user config dir (if changed),
+        evicting entries for files that no longer exist and capping the
+        cache size (oldest entries first; dicts keep insertion order)"""
+        if not self.probe_cache_dirty:
+            return
+        self.probe_cache = {
+            path: entry for path, entry in self.probe_cache.items()
+            if os.path.exists(path)}
+        while len(self.probe_cache) > self.PROBE_CACHE_LIMIT:
+            self.probe_cache.pop(next(iter(self.probe_cache)))
+        try:
+            with open(self.PROBE_CACHE_PATH, "w") as f:
+                json.dump(self.probe_cache, f)
+            self.probe_cache_dirty = False
+        except OSError as ex:
+            log.warning("Couldn't save probe cache {}: {}".format(self.PROBE_CACHE_PATH, ex))
+
+    def file_probe_finished(self, filepath, file_data, generation):
+        """Handle a finished probe (runs on the UI thread). Results are
+        handled strictly one at a time: the image-sequence prompt runs a
+        nested event loop, which would otherwise deliver the queued
+        results for the sibling frames re-entrantly — importing them as
+        standalone images before the user has even answered"""
+        if generation != self.probe_generation:
+            # Stale result from before a project load
+            return
+        self.deferred_probe_results.append((filepath, file_data, generation))
+        if self.handling_probe_result:
+            # Re-entrant delivery; the outer call drains the queue
+            return
+
+        self.handling_probe_result = True
+        try:
+            while self.deferred_probe_results:
+                (filepath, file_data, generation) = self.deferred_probe_results.pop(0)
+                if generation != self.probe_generation:
+                    # Invalidated while waiting in the queue
+                    continue
+                self.import_probed_file(filepath, file_data)
+        finally:
+            self.handling_probe_result = False
+
+    def import_probed_file(self, filepath, file_data):
+        """Finish importing a probed media file (runs on the UI thread,
+        so image-sequence prompts and project updates stay safe)"""
+        app = self.app
+        (dir_path, filename) = os.path.split(filepath)
+        image_seq_details = self.pending_seq_details.pop(filepath, None)
+        imported = False
+
+        try:
+            # Skip files claimed by an image sequence (or imported some
+            # other way) while this probe was still running
+            if filepath in self.imported_seq_paths or File.get(path=filepath):
                 return
 
-            try:
-                # Load filepath in libopenshot clip object (which will try multiple readers to open it)
-                clip = openshot.Clip(filepath)
-
-                # Get the JSON for the clip's internal reader
-                reader = clip.Reader()
-                file_data = json.loads(reader.Json())
-
-                # Determine media type
-                if file_data["has_video"] and not is_image(file_data):
-                    file_data["media_type"] = "video"
-                elif file_data["has_video"] and is_image(file_data):
-                    file_data["media_type"] = "image"
-                elif file_data["has_audio"] and not file_data["has_video"]:
-                    file_data["media_type"] = "audio"
+            # Determine media type (well-known extensions skip the
+            # more expensive reader-based classification)
+            ext_media_type = EXT_MEDIA_TYPES.get(os.path.splitext(filepath)[1].lower())
+            if ext_media_type:
+                file_data["media_type"] = ext_media_type
+            elif file_data["has_video"] and not is_image(file_data):
+                file_data["media_type"] = "video"
+            elif file_data["has_video"] and is_image(file_data):
+                file_data["media_type"] = "image"
+            elif file_data["has_audio"] and not file_data["has_video"]:
+                file_data["media_type"] = "audio"
+            else:
+                # If none set, just assume video
+                file_data["media_type"] = "video"
+
+            # Save new file to the project data
+            file = File()
+            file.data = file_data
+
+            if not image_seq_details:
+                # Try to discover image sequence, if not supplied
+                image_seq_details = self.get_image_sequence_details(filepath)
+
+            # Is this an image sequence / animation?
+            if image_seq_details:
+                # Update file with correct path
+                folder_path = image_seq_details["folder_path"]
+                base_name = image_seq_details["base_name"]
+                fixlen = image_seq_details["fixlen"]
+                digits = image_seq_details["digits"]
+                extension = image_seq_details["extension"]
+
+                if not fixlen:
+                    zero_pattern = "%d"
                 else:
-                    # If none set, just assume video
-                    file_data["media_type"] = "video"
-
-                # Save new file to the project data
-                file = File()
-                file.data = file_data
-
-                if not image_seq_details:
-                    # Try to discover image sequence, if not supplied
-                    image_seq_details = self.get_image_sequence_details(filepath)
-
-                # Is this an image sequence / animation?
-                if image_seq_details:
-                    # Update file with correct path
-                    folder_path = image_seq_details["folder_path"]
-                    base_name = image_seq_details["base_name"]
-                    fixlen = image_seq_details["fixlen"]
-                    digits = image_seq_details["digits"]
-                    extension = image_seq_details["extension"]
-
-                    if not fixlen:
-                        zero_pattern = "%d"
-                    else:
-                        zero_pattern = "%%0%sd" % digits
-
-                    # Generate the regex pattern for this image sequence
-                    pattern = "%s%s.%s" % (base_name, zero_pattern, extension)
-
-                    # Split folder name
-                    folderName = os.path.basename(folder_path)
-                    if not base_name:
-                        # Give alternate name
-                        file.data["name"] = "%s (%s)" % (folderName, pattern)
-
-                    # Load image sequence (to determine duration and video_length)
-                    image_seq = openshot.Clip(os.path.join(folder_path, pattern))
-
-                    # Update file details
-                    file.data["path"] = os.path.join(folder_path, pattern)
-                    file.data["media_type"] = "video"
-                    file.data["duration"] = image_seq.Reader().info.duration
-                    file.data["video_length"] = image_seq.Reader().info.video_length
-
-                    log.info('Imported {} as image sequence {}'.format(
-                        filepath, pattern))
-
-                    # Remove any other image sequence files from the list we're processing
-                    match_glob = "{}{}.{}".format(base_name, '[0-9]*', extension)
-                    for seq_file in glob.iglob(os.path.join(folder_path, match_glob)):
-                        if seq_file in files:
-                            files.remove(seq_file)
-
-                if not image_seq_details:
-                    # Log our not-an-image-sequence import
-                    log.info("Imported media file {}".format(filepath))
-
-                # Save file
-                file.save()
-
-                prev_path = app.project.get("import_path")
-                if dir_path != prev_path:
-                    app.updates.update_untracked(["import_path"], dir_path)
-
-            except Exception as ex:
-                # Log exception
-                log.warning("Failed to import {}: {}".format(filepath, ex))
-
-                # Show message box to user
-                app.window.invalidImage(filename)
-
-        # Reset list of ignored paths
-        self.ignore_image_sequence_paths = []
+                    zero_pattern = "%%0%sd" % digits
+
+                # Generate the regex pattern for this image sequence
+                pattern = "%s%s.%s" % (base_name, zero_pattern, extension)
+
+                # Split folder name
+                folderName = os.path.basename(folder_path)
+                if not base_name:
+                    # Give alternate name
+                    file.data["name"] = "%s (%s)" % (folderName, pattern)
+
+                seq_path = os.path.join(folder_path, pattern)
+                if File.get(path=seq_path):
+                    # Another frame already imported this sequence
+                    return
+
+                # Load image sequence (to determine duration and video_length)
+                image_seq = openshot.Clip(seq_path)
+
+                # Update file details
+                file.data["path"] = seq_path
+                file.data["media_type"] = "video"
+                file.data["duration"] = image_seq.Reader().info.duration
+                file.data["video_length"] = image_seq.Reader().info.video_length
+
+                log.info('Imported {} as image sequence {}'.format(
+                    filepath, pattern))
+
+                # Mark the other frames of this sequence, so pending
+                # probes don't import them individually
+                match_glob = "{}{}.{}".format(base_name, '[0-9]*', extension)
+                for seq_file in glob.iglob(os.path.join(folder_path, match_glob)):
+                    self.imported_seq_paths.add(seq_file)
+
+            if not image_seq_details:
+                # Log our not-an-image-sequence import
+                log.info("Imported media file {}".format(filepath))
+
+            # Save file
+            file.save()
+
+            # Let interested views (e.g. the timeline) act on the import
+            imported = True
+            self.FileImported.emit(filepath, file.id)
+
+            prev_path = app.project.get("import_path")
+            if dir_path != prev_path:
+                app.updates.update_untracked(["import_path"], dir_path)
+
+        except Exception as ex:
+            # Log exception
+            log.warning("Failed to import {}: {}".format(filepath, ex))
+
+            # Show message box to user
+            app.window.invalidImage(filename)
+
+        finally:
+            if not imported:
+                # No file will appear for this path (claimed by a
+                # sequence, already imported, or the import failed)
+                self.FileImportFailed.emit(filepath)
+            self.probe_done()
 
     def get_image_sequence_details(self, file_path):
         """Inspect a file path and determine if this is an image sequence"""
@@ -398,7 +790,7 @@ class FilesModel(QObject, updates.UpdateInterface):
             # Ignore this path (temporarily)
             self.ignore_image_sequence_paths.append(dirName)
 
-            if not get_app().window.promptImageSequence(fileName):
+            if not self.app.window.promptImageSequence(fileName):
                 # User said no, don't import as a sequence
                 return None
 
@@ -424,7 +816,7 @@ class FilesModel(QObject, updates.UpdateInterface):
             thumb_cache = "no-cache/"
 
         # Connect to thumbnail server and get image
-        thumb_server_details = get_app().window.http_server_thread.server_address
+        thumb_server_details = self.app.window.http_server_thread.server_address
         thumb_address = "http://%s:%s/thumbnails/%s/%s/path/%s" % (
         thumb_server_details[0], thumb_server_details[1], file_id, thumbnail_frame, thumb_cache)
         r = get(thumb_address)
@@ -434,48 +826,69 @@ class FilesModel(QObject, updates.UpdateInterface):
         else:
             return ''
 
+    def drag_pixmap(self, file_id, icon, size):
+        """Get the drag pixmap for a file, rasterizing the icon only the
+        first time it is dragged"""
+        pixmap = self.drag_pixmaps.get(file_id)
+        if not pixmap:
+            pixmap = icon.pixmap(size)
+            self.drag_pixmaps[file_id] = pixmap
+        return pixmap
+
+    def file_by_id(self, file_id):
+        """Get a File object by ID from the model's cache, falling back
+        to a (linear) project-data query on a cache miss"""
+        file = self.files_by_id.get(file_id)
+        if not file:
+            file = File.get(id=file_id)
+            if file:
+                self.files_by_id[file_id] = file
+        return file
+
     def update_file_thumbnail(self, file_id):
         """Update/re-generate the thumbnail of a specific file"""
-        file = File.get(id=file_id)
+        file = self.file_by_id(file_id)
         path, filename = os.path.split(file.data["path"])
         name = filename
-        if "name" in file.data.keys():
+        if "name" in file.data:
             name = file.data["name"]
 
         # Refresh thumbnail for updated file
         self.ignore_updates = True
         m = self.model
-
-        if file_id in self.model_ids:
-            # Look up stored index to ID column
-            id_index = self.model_ids[file_id]
-            if not id_index.isValid():
-                return
-
-            # Update thumb for file
-            thumb_path = self.get_thumb_path(file_id, 1, clear_cache=True)
-            thumb_index = id_index.sibling(id_index.row(), 0)
-            item = m.itemFromIndex(thumb_index)
-            item.setIcon(QIcon(thumb_path))
-            item.setText(name)
-
-            # Emit signal when model is updated
-            self.ModelRefreshed.emit()
-
-        self.ignore_updates = False
+        try:
+            if file_id in self.model_ids:
+                # Look up stored index to ID column
+                id_index = self.model_ids[file_id]
+                if not id_index.isValid():
+                    return
+
+                # Update thumb for file (and drop any stale drag pixmap)
+                self.drag_pixmaps.pop(file_id, None)
+                thumb_path = self.get_thumb_path(file_id, 1, clear_cache=True)
+                thumb_index = id_index.sibling(id_index.row(), 0)
+                m.setData(thumb_index, QIcon(thumb_path), Qt.DecorationRole)
+                m.setData(thumb_index.sibling(thumb_index.row(), 1), name)
+
+                # Emit signal when model is updated
+                self.ModelRefreshed.emit()
+        finally:
+            self.ignore_updates = False
 
     def selected_file_ids(self):
         """ Get a list of file IDs for all selected files """
-        # Get the indexes for column 5 of all selected rows
-        selected = self.selection_model.selectedRows(5)
+        # Map each selected proxy row to the model's id column list
+        ids = self.model.ids
+        map_to_source = self.proxy_model.mapToSource
 
-        return [idx.data() for idx in selected]
+        return [ids[map_to_source(idx).row()]
+                for idx in self.selection_model.selectedRows()]
 
     def selected_files(self):
         """ Get a list of File objects representing the current selection """
         files = []
         for id in self.selected_file_ids():
-            files.append(File.get(id=id))
+            files.append(self.file_by_id(id))
         return files
 
     def current_file_id(self):
@@ -483,7 +896,9 @@ class FilesModel(QObject, updates.UpdateInterface):
         cur = self.selection_model.currentIndex()
 
         if not cur or not cur.isValid() and self.selection_model.hasSelection():
-            cur = self.selection_model.selectedIndexes()[0]
+            # One index per selected row (avoids the row x column
+            # expansion of selectedIndexes)
+            cur = self.selection_model.selectedRows()[0]
 
         if cur and cur.isValid():
             return cur.sibling(cur.row(), 5).data()
@@ -492,7 +907,7 @@ class FilesModel(QObject, updates.UpdateInterface):
         """ Get the File object for the current files-view item, or the first selection """
         cur_id = self.current_file_id()
         if cur_id:
-            return File.get(id=cur_id)
+            return self.file_by_id(cur_id)
 
     def __init__(self, *args):
 
@@ -501,12 +916,43 @@ class FilesModel(QObject, updates.UpdateInterface):
         app = get_app()
         app.updates.add_listener(self)
 
-        # Create standard model
-        self.model = QStandardItemModel()
-        self.model.setColumnCount(6)
+        # Cache the app reference (this is used from several hot paths)
+        self.app = app
+
+        # Create custom model backed by plain Python rows
+        self.model = FilesItemModel()
         self.model_ids = {}
+        self.files_by_id = {}
         self.ignore_updates = False
 
+        # True only while update_model is running (re-entrancy guard)
+        self._refreshing = False
+
+        # Rasterized drag pixmaps, keyed by file ID
+        self.drag_pixmaps = {}
+
+        # When True, insert actions are coalesced into one model refresh
+        self.batch_updates = False
+
+        # Probe cache (loaded lazily on first import)
+        self.probe_cache = None
+        self.probe_cache_dirty = False
+
+        # Background probe bookkeeping: in-flight probe count, optional
+        # image-sequence details per queued path, and frame paths already
+        # claimed by an imported sequence
+        self.pending_probes = 0
+        self.pending_seq_details = {}
+        self.imported_seq_paths = set()
+
+        # Queue serializing probe-result handling (one import at a time,
+        # even when a modal prompt pumps the event loop)
+        self.handling_probe_result = False
+        self.deferred_probe_results = []
+
+        # Bumped to invalidate in-flight probes (e.g. on project load)
+        self.probe_generation = 0
+
         self.ignore_image_sequence_paths = []
 
         # Create proxy model (for sorting and filtering)
@@ -526,6 +972,12 @@ class FilesModel(QObject, updates.UpdateInterface):
         # Call init for superclass QObject
         super(QObject, FilesModel).__init__(self, *args)
 
+        # Timer coalescing model refreshes while probe results stream in
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setSingleShot(True)
+        self.refresh_timer.setInterval(100)
+        self.refresh_timer.timeout.connect(lambda: self.update_model(clear=False))
+
         # Attempt to load model testing interface, if requested
         # (will only succeed with Qt 5.11+)
         if info.MODEL_TEST:
@@ -28,51 +28,38 @@
 
 import os
 
-from PyQt5.QtCore import QSize, Qt, QPoint, QRegExp
+from PyQt5.QtCore import QSize, Qt, QPoint, QRegExp, QTimer
 from PyQt5.QtGui import QDrag, QCursor
 from PyQt5.QtWidgets import QListView, QAbstractItemView, QMenu
 
 from classes.app import get_app
 from classes.logger import log
-from classes.query import File
 
 
 class FilesListView(QListView):
     """ A ListView QWidget used on the main window """
     drag_item_size = 48
 
-    def contextMenuEvent(self, event):
-
-        # Set context menu mode
-        app = get_app()
-        app.context_menu_object = "files"
-
-        index = self.indexAt(event.pos())
-
-        # Build menu
+    def build_context_menus(self):
+        """Build the context menus once; contextMenuEvent just picks the
+        variant matching the clicked row (the actions are shared with the
+        main window, so per-popup visibility toggles would leak there)"""
+        # Menu shown when no valid file is under the cursor
         menu = QMenu(self)
-
         menu.addAction(self.win.actionImportFiles)
         menu.addAction(self.win.actionDetailsView)
+        self.empty_menu = menu
 
-        if index.isValid():
-            # Look up the model item and our unique ID
-            model = self.model()
-
-            # Look up file_id from 5th column of row
-            id_index = index.sibling(index.row(), 5)
-            file_id = model.data(id_index, Qt.DisplayRole)
-
-            # If a valid file selected, show file related options
+        # Menus shown for a file row (with title options for svg files)
+        for svg_file in (False, True):
+            menu = QMenu(self)
+            menu.addAction(self.win.actionImportFiles)
+            menu.addAction(self.win.actionDetailsView)
             menu.addSeparator()
-
-            # Add edit title option (if svg file)
-            file = File.get(id=file_id)
-            if file and file.data.get("path").endswith(".svg"):
+            if svg_file:
                 menu.addAction(self.win.actionEditTitle)
                 menu.addAction(self.win.actionDuplicateTitle)
                 menu.addSeparator()
-
             menu.addAction(self.win.actionPreview_File)
             menu.addAction(self.win.actionSplitClip)
             menu.addAction(self.win.actionAdd_to_Timeline)
@@ -80,6 +67,29 @@ class FilesListView(QListView):
             menu.addSeparator()
             menu.addAction(self.win.actionRemove_from_Project)
             menu.addSeparator()
+            if svg_file:
+                self.svg_file_menu = menu
+            else:
+                self.file_menu = menu
+
+    def contextMenuEvent(self, event):
+
+        # Set context menu mode
+        app = self.app
+        app.context_menu_object = "files"
+
+        index = self.indexAt(event.pos())
+
+        # Pick the pre-built menu for this row
+        menu = self.empty_menu
+        if index.isValid():
+            # Look up file from the id column of this row
+            file_id = index.sibling(index.row(), 5).data()
+            file = self.files_model.file_by_id(file_id)
+            if file and file.data.get("path").endswith(".svg"):
+                menu = self.svg_file_menu
+            else:
+                menu = self.file_menu
 
         # Show menu
         menu.exec_(event.globalPos())
@@ -93,11 +103,14 @@ class FilesListView(QListView):
     def startDrag(self, supportedActions):
         """ Override startDrag method to display custom icon """
 
+        # Get the selection model once (each call builds a new wrapper)
+        selection = self.selectionModel()
+
         # Get first column indexes for all selected rows
-        selected = self.selectionModel().selectedRows(0)
+        selected = selection.selectedRows(0)
 
         # Get image of current item
-        current = self.selectionModel().currentIndex()
+        current = selection.currentIndex()
         if not current.isValid() and selected:
             current = selected[0]
 
@@ -106,13 +119,15 @@ class FilesListView(QListView):
             log.warning("No draggable items found in model!")
             return False
 
-        # Get icon from column 0 on same row as current item
+        # Get icon and file ID from same row as current item
         icon = current.sibling(current.row(), 0).data(Qt.DecorationRole)
+        file_id = current.sibling(current.row(), 5).data()
 
-        # Start drag operation
+        # Start drag operation (reusing the cached drag pixmap, if any)
         drag = QDrag(self)
         drag.setMimeData(self.model().mimeData(selected))
-        drag.setPixmap(icon.pixmap(QSize(self.drag_item_size, self.drag_item_size)))
+        drag.setPixmap(self.files_model.drag_pixmap(
+            file_id, icon, QSize(self.drag_item_size, self.drag_item_size)))
         drag.setHotSpot(QPoint(self.drag_item_size / 2, self.drag_item_size / 2))
         drag.exec_()
 
@@ -123,13 +138,17 @@ class FilesListView(QListView):
     # Handle a drag and drop being dropped on widget
     def dropEvent(self, event):
         # Set cursor to waiting
-        get_app().setOverrideCursor(QCursor(Qt.WaitCursor))
+        self.app.setOverrideCursor(QCursor(Qt.WaitCursor))
 
         media_paths = []
         for uri in event.mimeData().urls():
             log.info('Processing drop event for {}'.format(uri))
+            if not uri.isLocalFile():
+                # Remote URLs can't be imported
+                continue
             filepath = uri.toLocalFile()
-            if os.path.exists(filepath) and os.path.isfile(filepath):
+            # isfile() already implies existence (a single stat call)
+            if os.path.isfile(filepath):
                 log.info('Adding file: {}'.format(filepath))
                 if ".osp" in filepath:
                     # Auto load project passed as argument
@@ -137,20 +156,25 @@ class FilesListView(QListView):
                     event.accept()
                 else:
                     media_paths.append(filepath)
+            elif os.path.isdir(filepath):
+                # Folders are imported recursively by the model
+                log.info('Adding folder: {}'.format(filepath))
+                media_paths.append(filepath)
 
         # Import all new media files
         if media_paths and self.files_model.add_files(media_paths):
             event.accept()
 
         # Restore cursor
-        get_app().restoreOverrideCursor()
+        self.app.restoreOverrideCursor()
 
     # Pass file add requests to the model
     def add_file(self, filepath):
         self.files_model.add_files(filepath)
 
     def filter_changed(self):
-        self.refresh_view()
+        # Coalesce rapid keystrokes into a single refresh_view call
+        self.filter_timer.start()
 
     def refresh_view(self):
         """Filter files with proxy class"""
@@ -168,13 +192,17 @@ class FilesListView(QListView):
         # Invoke parent init
         super().__init__(*args)
 
-        # Get a reference to the window object
-        self.win = get_app().window
+        # Get a reference to the app and window objects
+        self.app = get_app()
+        self.win = self.app.window
 
         # Get Model data
         self.files_model = model
         self.setModel(self.files_model.proxy_model)
 
+        # Build the static context menus
+        self.build_context_menus()
+
         # Remove the default selection model and wire up to the shared one
         self.selectionModel().deleteLater()
         self.setSelectionMode(QAbstractItemView.ExtendedSelection)
@@ -200,10 +228,17 @@ class FilesListView(QListView):
 
         self.files_model.ModelRefreshed.connect(self.refresh_view)
 
+        # Timer to debounce filter-box keystrokes (refresh only runs
+        # once the user pauses typing)
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(150)
+        self.filter_timer.timeout.connect(self.refresh_view)
+
         # Load initial files model data
         self.files_model.update_model()
 
         # setup filter events
-        app = get_app()
+        app = self.app
         app.window.filesFilter.textChanged.connect(self.filter_changed)
         app.window.refreshFilesSignal.connect(self.refresh_view)
@@ -29,51 +29,38 @@
 
 import os
 
-from PyQt5.QtCore import QSize, Qt, QPoint
+from PyQt5.QtCore import QSize, Qt, QPoint, QTimer
 from PyQt5.QtGui import QDrag, QCursor
 from PyQt5.QtWidgets import QTreeView, QAbstractItemView, QMenu, QSizePolicy, QHeaderView
 
 from classes.app import get_app
 from classes.logger import log
-from classes.query import File
 
 
 class FilesTreeView(QTreeView):
     """ A TreeView QWidget used on the main window """
     drag_item_size = 48
 
-    def contextMenuEvent(self, event):
-
-        # Set context menu mode
-        app = get_app()
-        app.context_menu_object = "files"
-
-        index = self.indexAt(event.pos())
-
-        # Build menu
+    def build_context_menus(self):
+        """Build the context menus once; contextMenuEvent just picks the
+        variant matching the clicked row (the actions are shared with the
+        main window, so per-popup visibility toggles would leak there)"""
+        # Menu shown when no valid file is under the cursor
         menu = QMenu(self)
-
         menu.addAction(self.win.actionImportFiles)
         menu.addAction(self.win.actionThumbnailView)
+        self.empty_menu = menu
 
-        if index.isValid():
-            # Look up the model item and our unique ID
-            model = index.model()
-
-            # Look up file_id from 5th column of row
-            id_index = index.sibling(index.row(), 5)
-            file_id = model.data(id_index, Qt.DisplayRole)
-
-            # If a valid file selected, show file related options
+        # Menus shown for a file row (with title options for svg files)
+        for svg_file in (False, True):
+            menu = QMenu(self)
+            menu.addAction(self.win.actionImportFiles)
+            menu.addAction(self.win.actionThumbnailView)
             menu.addSeparator()
-
-            # Add edit title option (if svg file)
-            file = File.get(id=file_id)
-            if file and file.data.get("path").endswith(".svg"):
+            if svg_file:
                 menu.addAction(self.win.actionEditTitle)
                 menu.addAction(self.win.actionDuplicateTitle)
                 menu.addSeparator()
-
             menu.addAction(self.win.actionPreview_File)
             menu.addAction(self.win.actionSplitClip)
             menu.addAction(self.win.actionAdd_to_Timeline)
@@ -81,6 +68,29 @@ class FilesTreeView(QTreeView):
             menu.addSeparator()
             menu.addAction(self.win.actionRemove_from_Project)
             menu.addSeparator()
+            if svg_file:
+                self.svg_file_menu = menu
+            else:
+                self.file_menu = menu
+
+    def contextMenuEvent(self, event):
+
+        # Set context menu mode
+        app = self.app
+        app.context_menu_object = "files"
+
+        index = self.indexAt(event.pos())
+
+        # Pick the pre-built menu for this row
+        menu = self.empty_menu
+        if index.isValid():
+            # Look up file from the id column of this row
+            file_id = index.sibling(index.row(), 5).data()
+            file = self.files_model.file_by_id(file_id)
+            if file and file.data.get("path").endswith(".svg"):
+                menu = self.svg_file_menu
+            else:
+                menu = self.file_menu
 
         # Show menu
         menu.exec_(event.globalPos())
@@ -94,11 +104,14 @@ class FilesTreeView(QTreeView):
     def startDrag(self, supportedActions):
         """ Override startDrag method to display custom icon """
 
+        # Get the selection model once (each call builds a new wrapper)
+        selection = self.selectionModel()
+
         # Get first column indexes for all selected rows
-        selected = self.selectionModel().selectedRows(0)
+        selected = selection.selectedRows(0)
 
         # Get image of current item
-        current = self.selectionModel().currentIndex()
+        current = selection.currentIndex()
         if not current.isValid() and selected:
             current = selected[0]
 
@@ -107,13 +120,15 @@ class FilesTreeView(QTreeView):
             log.warning("No draggable items found in model!")
             return False
 
-        # Get icon from column 0 on same row as current item
+        # Get icon and file ID from same row as current item
         icon = current.sibling(current.row(), 0).data(Qt.DecorationRole)
+        file_id = current.sibling(current.row(), 5).data()
 
-        # Start drag operation
+        # Start drag operation (reusing the cached drag pixmap, if any)
         drag = QDrag(self)
         drag.setMimeData(self.model().mimeData(selected))
-        drag.setPixmap(icon.pixmap(QSize(self.drag_item_size, self.drag_item_size)))
+        drag.setPixmap(self.files_model.drag_pixmap(
+            file_id, icon, QSize(self.drag_item_size, self.drag_item_size)))
         drag.setHotSpot(QPoint(self.drag_item_size / 2, self.drag_item_size / 2))
         drag.exec_()
 
@@ -127,13 +142,17 @@ class FilesTreeView(QTreeView):
         self.ignore_image_sequence_paths = []
 
         # Set cursor to waiting
-        get_app().setOverrideCursor(QCursor(Qt.WaitCursor))
+        self.app.setOverrideCursor(QCursor(Qt.WaitCursor))
 
         media_paths = []
         for uri in event.mimeData().urls():
             log.info('Processing drop event for {}'.format(uri))
+            if not uri.isLocalFile():
+                # Remote URLs can't be imported
+                continue
             filepath = uri.toLocalFile()
-            if os.path.exists(filepath) and os.path.isfile(filepath):
+            # isfile() already implies existence (a single stat call)
+            if os.path.isfile(filepath):
                 log.info('Adding file: {}'.format(filepath))
                 if ".osp" in filepath:
                     # Auto load project passed as argument
@@ -141,63 +160,86 @@ class FilesTreeView(QTreeView):
                     event.accept()
                 else:
                     media_paths.append(filepath)
+            elif os.path.isdir(filepath):
+                # Folders are imported recursively by the model
+                log.info('Adding folder: {}'.format(filepath))
+                media_paths.append(filepath)
 
         # Import all new media files
         if media_paths and self.files_model.add_files(media_paths):
             event.accept()
 
         # Restore cursor
-        get_app().restoreOverrideCursor()
+        self.app.restoreOverrideCursor()
 
     # Forward file-add requests to the model, for legacy code (previous API)
     def add_file(self, filepath):
         self.files_model.add_files(filepath)
 
     def filter_changed(self):
-        self.refresh_view()
+        # Coalesce rapid keystrokes into a single refresh_view call
+        self.filter_timer.start()
 
     def refresh_view(self):
         """Resize and hide certain columns"""
-        self.hideColumn(3)
-        self.hideColumn(4)
-        self.hideColumn(5)
-        self.resize_contents()
+        # Suspend view updates so the header and viewport only
+        # recompute once for the whole column adjustment
+        self.setUpdatesEnabled(False)
+        try:
+            self.hideColumn(3)
+            self.hideColumn(4)
+            self.hideColumn(5)
+            self.resize_contents()
+        finally:
+            self.setUpdatesEnabled(True)
 
     def resize_contents(self):
         # Get size of widget
         thumbnail_width = 78
         tags_width = 75
+        header = self.header()
 
         # Resize thumbnail and tags column
-        self.header().resizeSection(0, thumbnail_width)
-        self.header().resizeSection(2, tags_width)
+        header.resizeSection(0, thumbnail_width)
+        header.resizeSection(2, tags_width)
 
         # Set stretch mode on certain columns
-        self.header().setStretchLastSection(False)
-        self.header().setSectionResizeMode(1, QHeaderView.Stretch)
-        self.header().setSectionResizeMode(2, QHeaderView.Interactive)
+        header.setStretchLastSection(False)
+        header.setSectionResizeMode(1, QHeaderView.Stretch)
+        header.setSectionResizeMode(2, QHeaderView.Interactive)
 
-    def value_updated(self, item):
+    def value_updated(self, index):
         """ Name or tags updated """
         if self.files_model.ignore_updates:
             return
 
-        # Get translation method
-        _ = get_app()._tr
+        # Only the name and tags columns are editable; changes to other
+        # columns (e.g. icon updates) don't need a project save
+        if index.column() not in (1, 2):
+            return
 
-        # Determine what was changed
-        file_id = self.files_model.model.item(item.row(), 5).text()
-        name = self.files_model.model.item(item.row(), 1).text()
-        tags = self.files_model.model.item(item.row(), 2).text()
+        # Get translation method
+        _ = self.app._tr
+
+        # Determine what was changed (index is a source-model index)
+        model = self.files_model.model
+        file_id = model.ids[index.row()]
+        name = model.names[index.row()]
+        tags = model.tags[index.row()]
+
+        # Get file object and determine the new friendly name
+        f = self.files_model.file_by_id(file_id)
+        filename = os.path.split(f.data["path"])[-1]
+        if not name:
+            name = filename
+
+        # Skip the save entirely when nothing actually changed
+        if name == f.data.get("name", filename) and tags == f.data.get("tags", ""):
+            return
 
-        # Get file object and update friendly name and tags attribute
-        f = File.get(id=file_id)
-        if name and name != os.path.split(f.data["path"])[-1]:
-            f.data["name"] = name
-        else:
-            f.data["name"] = os.path.split(f.data["path"])[-1]
+        f.data["name"] = name
 
-        if "tags" in f.data.keys():
+        if "tags" in f.data:
             if tags != f.data["tags"]:
                 f.data["tags"] = tags
         elif tags:
@@ -213,13 +255,17 @@ class FilesTreeView(QTreeView):
         # Invoke parent init
         super().__init__(*args)
 
-        # Get a reference to the window object
-        self.win = get_app().window
+        # Get a reference to the app and window objects
+        self.app = get_app()
+        self.win = self.app.window
 
         # Get Model data
         self.files_model = model
         self.setModel(self.files_model.proxy_model)
 
+        # Build the static context menus
+        self.build_context_menus()
+
         # Remove the default selection model and wire up to the shared one
         self.selectionModel().deleteLater()
         self.setSelectionMode(QAbstractItemView.ExtendedSelection)
@@ -242,8 +288,15 @@ class FilesTreeView(QTreeView):
 
         self.files_model.ModelRefreshed.connect(self.refresh_view)
 
+        # Timer to debounce filter-box keystrokes (refresh only runs
+        # once the user pauses typing)
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(150)
+        self.filter_timer.timeout.connect(self.refresh_view)
+
         # Load initial files model data
         self.files_model.update_model()
 
         # setup filter events
-        # self.files_model.model.itemChanged.connect(self.value_updated)
+        # self.files_model.model.dataChanged.connect(self.value_updated)
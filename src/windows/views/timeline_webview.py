@@ -2991,7 +2991,15 @@ class TimelineWebView(TimelineMixin, updates.UpdateInterface):
             self.addEffect(data, pos)
 
         elif self.item_type == "os_drop":
-            # Add new files to project
+            if self.pending_drop_clips is None:
+                # Connect lazily (the files model is created after this
+                # view during main-window setup)
+                self.pending_drop_clips = {}
+                files_model = get_app().window.files_model
+                files_model.FileImported.connect(self.file_imported)
+                files_model.FileImportFailed.connect(self.file_import_failed)
+
+            # Add new files to project (imports run in the background)
             get_app().window.filesView.dropEvent(event)
 
             # Add clips for each file dropped
@@ -3000,11 +3008,17 @@ class TimelineWebView(TimelineMixin, updates.UpdateInterface):
                 if not os.path.exists(filepath) or not os.path.isfile(filepath):
                     continue
 
-                # Valid file, so create clip for it
-                log.debug('Adding clip for {}'.format(os.path.basename(filepath)))
-                for file in File.filter(path=filepath):
-                    # Insert clip for this file at this position
-                    self.addClip([file.id], pos)
+                existing_files = File.filter(path=filepath)
+                if existing_files:
+                    # File already in the project, so create clip for it
+                    log.debug('Adding clip for {}'.format(os.path.basename(filepath)))
+                    for file in existing_files:
+                        # Insert clip for this file at this position
+                        self.addClip([file.id], pos)
+                else:
+                    # Still being probed; create the clip once the
+                    # import finishes (see file_imported)
+                    self.pending_drop_clips[filepath] = pos
 
         # Clear new clip
         self.new_item = False
@@ -3015,6 +3029,20 @@ class TimelineWebView(TimelineMixin, updates.UpdateInterface):
         get_app().window.refreshFrameSignal.emit()
         get_app().window.propertyTableView.select_frame(self.window.preview_thread.player.Position())
 
+    def file_imported(self, filepath, file_id):
+        """Create the deferred clip for a file dropped on the timeline,
+        once its background import has finished"""
+        pos = self.pending_drop_clips.pop(filepath, None)
+        if pos is not None:
+            log.debug('Adding clip for {}'.format(os.path.basename(filepath)))
+            self.addClip([file_id], pos)
+
+    def file_import_failed(self, filepath):
+        """Forget the deferred drop position for a file that won't be
+        imported (failed probe, or claimed by an image sequence), so a
+        later import of the same path can't spawn a stray clip"""
+        self.pending_drop_clips.pop(filepath, None)
+
     def dragLeaveEvent(self, event):
         """A drag is in-progress and the user moves mouse outside of timeline"""
         log.debug('dragLeaveEvent - Undo drop')
@@ -3108,6 +3136,10 @@ class TimelineWebView(TimelineMixin, updates.UpdateInterface):
         self.item_type = None
         self.item_id = None
 
+        # Drop positions of files still importing (path -> position);
+        # None until the first os_drop connects to the files model
+        self.pending_drop_clips = None
+
         # Delayed zoom audio redraw
         self.redraw_audio_timer = QTimer(self)
         self.redraw_audio_timer.setInterval(300)